@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+import tracemalloc
+from nx_missing.records import Title, DLC, write_records
+
+# Number of synthetic rows, close to the size of titles_db and missing-dlcs
+TITLE_ROWS = 200000
+DLC_ROWS = 100000
+
+# Function to generate synthetic title and DLC source rows
+def generate_rows():
+    titles = [(f"0100{i:08X}0000", f"20{i % 30:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}", f"Title {i}", i * 1024) for i in range(TITLE_ROWS)]
+    dlcs = [(f"0100{i:08X}1001", f"20{i % 30:02d}-{i % 12 + 1:02d}-{i % 28 + 1:02d}", f"DLC {i}", f"Base Game {i // 10}", i * 512) for i in range(DLC_ROWS)]
+    return titles, dlcs
+
+# Function reproducing the previous stages: dicts with string keys plus a separate list of f-string rows
+def build_with_dicts(output_directory, titles, dlcs):
+    titles_json = {}
+    titles_txt = []
+    for title_id, release_date, title_name, size in titles:
+        titles_json[title_id] = {"Release Date": release_date, "Title Name": title_name, "size": size}
+        titles_txt.append(f"{title_id}|{release_date}|{title_name}|{size}")
+
+    dlcs_json = {}
+    dlcs_txt = []
+    for title_id, release_date, dlc_name, base_game, size in dlcs:
+        dlcs_json[title_id] = {"Release Date": release_date, "dlc_name": dlc_name, "base_game": base_game, "size": size}
+        dlcs_txt.append(f"{title_id}|{dlcs_json[title_id]['Release Date']}|{dlcs_json[title_id]['dlc_name']}|{dlcs_json[title_id]['base_game']}|{dlcs_json[title_id]['size']}")
+
+    for name, json_content, txt_content in (('titles', titles_json, titles_txt), ('dlcs', dlcs_json, dlcs_txt)):
+        with open(os.path.join(output_directory, f"{name}.json"), 'w', encoding='utf-8') as json_file:
+            json.dump(json_content, json_file, indent=4)
+        with open(os.path.join(output_directory, f"{name}.txt"), 'w', encoding='utf-8') as txt_file:
+            txt_file.write('\n'.join(txt_content))
+
+# Function using the shared record types and the single-pass serializer
+def build_with_records(output_directory, titles, dlcs):
+    title_records = {row[0]: Title(*row) for row in titles}
+    dlc_records = {row[0]: DLC(*row) for row in dlcs}
+    write_records(output_directory, 'titles', title_records.values())
+    write_records(output_directory, 'dlcs', dlc_records.values())
+
+# Function to measure the wall time and peak traced memory of one build (timed separately, as tracing slows it down)
+def measure(build, titles, dlcs):
+    with tempfile.TemporaryDirectory() as output_directory:
+        start_time = time.perf_counter()
+        build(output_directory, titles, dlcs)
+        elapsed = time.perf_counter() - start_time
+
+        tracemalloc.start()
+        build(output_directory, titles, dlcs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+# Modules whose import time is tracked: the CLI, each stage, and the heavy dependencies they load lazily
+IMPORT_MODULES = ["nx_missing.cli", "nx_missing.library", "nx_missing.titles", "nx_missing.updates", "nx_missing.dlcs", "aiohttp", "requests"]
+
+# Function to get the cumulative import time of a module in a fresh interpreter, from python -X importtime
+def measure_import_time(module):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        return None
+    # Lines look like "import time:      self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1].strip()) / 1000
+    return None
+
+# Function to get the wall time of starting the CLI, averaged over a few runs
+def measure_cli_startup(runs=5):
+    start_time = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, '-m', 'nx_missing', '--help'], capture_output=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return (time.perf_counter() - start_time) / runs * 1000
+
+# Main function to print the benchmark results
+def main():
+    titles, dlcs = generate_rows()
+    print(f"Serializing {TITLE_ROWS} title rows and {DLC_ROWS} DLC rows:")
+    for label, build in (("dicts + f-strings", build_with_dicts), ("slotted records", build_with_records)):
+        elapsed, peak = measure(build, titles, dlcs)
+        print(f"{label:>18}: {elapsed:6.2f}s, peak {peak / (1024 * 1024):7.1f} MB")
+
+    print("\nImport time (python -X importtime, cumulative):")
+    for module in IMPORT_MODULES:
+        import_time = measure_import_time(module)
+        print(f"{module:>20}: " + (f"{import_time:7.1f} ms" if import_time is not None else "not installed"))
+    print(f"\nCLI startup (python -m nx_missing --help): {measure_cli_startup():.1f} ms")
+
+# Run the main function
+if __name__ == "__main__":
+    main()
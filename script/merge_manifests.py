@@ -0,0 +1,6 @@
+import sys
+from nx_missing.cli import main
+
+# Kept for existing cron jobs and docs: same as "python -m nx_missing merge"
+if __name__ == "__main__":
+    sys.exit(main(['merge'] + sys.argv[1:]))
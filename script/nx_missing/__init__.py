@@ -0,0 +1,2 @@
+# NX Missing data pipeline. Stage modules are imported lazily by the command line (python -m nx_missing)
+# so that running one command does not load the dependencies of the others.
@@ -0,0 +1,100 @@
+import os
+import sys
+import argparse
+from .config import data_directory, load_env
+from .logs import setup_logging
+
+# Function to build the command line parser
+def build_parser():
+    parser = argparse.ArgumentParser(prog='nx_missing', description="Track missing Nintendo Switch titles, updates and DLCs.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="scan the library folders and write working.txt/working.json")
+
+    merge_parser = commands.add_parser('merge', help="merge the partial manifests of every storage node")
+    merge_parser.add_argument('manifest_directory', nargs='?', help="directory of the partial manifests (default: MERGE_MANIFEST_DIR)")
+
+    commands.add_parser('titles', help="rebuild titles_db and find missing titles")
+    commands.add_parser('updates', help="find missing updates")
+
+    dlcs_parser = commands.add_parser('dlcs', help="find missing DLCs")
+    dlcs_parser.add_argument('--backfill', action='store_true', help="only resolve base game names left as placeholders")
+
+    commands.add_parser('prices', help="fetch the prices of new or changed missing titles and DLCs and join them into their outputs")
+
+    run_all_parser = commands.add_parser('run-all', help="run every stage, then commit and push the data files")
+    run_all_parser.add_argument('--no-push', action='store_true', help="print the commit message instead of pushing")
+
+    check_missing_parser = commands.add_parser('check-missing', help="sort local dumps into already available and missing files")
+    check_missing_parser.add_argument('--source', default='./check_missing', help="folder of the dumps to check")
+    check_missing_parser.add_argument('--available', default='./already_in_ghosteshop', help="folder for files already available")
+    check_missing_parser.add_argument('--missing', default='./missing_files', help="folder for missing files")
+
+    history_parser = commands.add_parser('history', help="query the missing/resolved history")
+    history_commands = history_parser.add_subparsers(dest='query', required=True)
+    history_tid_parser = history_commands.add_parser('tid', help="every change recorded for a title ID")
+    history_tid_parser.add_argument('tid')
+    history_range_parser = history_commands.add_parser('range', help="every change recorded between two dates")
+    history_range_parser.add_argument('start')
+    history_range_parser.add_argument('end')
+
+    return parser
+
+# Function to print history records
+def print_history(records):
+    for record in records:
+        version = f" v{record['Version']}" if record['Version'] else ""
+        print(f"{record['Timestamp']} {record['Type']} {record['TID']}{version} {record['Event']}")
+
+# Main function of the command line; stage modules are imported only for the command that runs
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging()
+
+    # check-missing is a contributor tool that only needs requests: no .env and no data directory
+    if args.command == 'check-missing':
+        from .check_missing import check_missing
+        check_missing(args.source, args.available, args.missing)
+        return 0
+
+    load_env()
+    # History queries only read the data directory, so they do not create it
+    data_dir = data_directory(create=args.command != 'history')
+
+    if args.command == 'list':
+        from .library import scan_library
+        scan_library(data_dir)
+    elif args.command == 'merge':
+        from .manifest import merge_partial_manifests
+        manifest_directory = args.manifest_directory or os.getenv('MERGE_MANIFEST_DIR')
+        if not manifest_directory:
+            raise ValueError("MERGE_MANIFEST_DIR is not set in the .env file.")
+        return 0 if merge_partial_manifests(data_dir, manifest_directory) else 1
+    elif args.command == 'titles':
+        from .titles import update_titles
+        update_titles(data_dir)
+    elif args.command == 'updates':
+        from .updates import find_missing_updates
+        find_missing_updates(data_dir)
+    elif args.command == 'dlcs':
+        from .dlcs import backfill_base_game_names, find_missing_dlcs_with_base_names
+        if args.backfill:
+            backfill_base_game_names(data_dir)
+        else:
+            find_missing_dlcs_with_base_names(data_dir)
+    elif args.command == 'prices':
+        from .prices import update_prices
+        update_prices(data_dir)
+    elif args.command == 'run-all':
+        from .pipeline import run_all
+        return 0 if run_all(data_dir, push=not args.no_push) else 1
+    elif args.command == 'history':
+        from .history import query_range, query_tid
+        if args.query == 'tid':
+            print_history(query_tid(data_dir, args.tid))
+        else:
+            print_history(query_range(data_dir, args.start, args.end))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
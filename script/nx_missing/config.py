@@ -0,0 +1,25 @@
+import os
+
+# Root of the repository, two levels above this package (script/nx_missing)
+REPOSITORY_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+# Directory of the script folder, where the .env file and local caches live
+SCRIPT_DIRECTORY = os.path.join(REPOSITORY_DIRECTORY, 'script')
+
+# Function to load the .env file of the script folder, importing python-dotenv only when needed
+def load_env():
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(SCRIPT_DIRECTORY, '.env'))
+    # Also honour a .env in the working directory, as the standalone scripts did
+    load_dotenv()
+
+# Function to get the data directory, creating it if it doesn't exist unless the command only reads it
+def data_directory(create=True):
+    directory = os.getenv('NX_DATA_DIR') or os.path.join(REPOSITORY_DIRECTORY, 'data')
+    if create:
+        os.makedirs(directory, exist_ok=True)
+    return directory
+
+# Function to read a boolean setting from the environment
+def env_flag(name):
+    return os.getenv(name, '').strip().lower() in ('1', 'true', 'yes')
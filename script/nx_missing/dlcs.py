@@ -0,0 +1,208 @@
+import json
+import os
+import logging
+import asyncio
+from .stats import build_stats, load_stats, write_stats
+from .history import record_deltas
+from .records import DLC, write_records
+from .locks import dlcs_lock
+from .prices import apply_cached_prices
+
+logger = logging.getLogger(__name__)
+
+# Base game names written when a lookup failed or did not finish within the budget
+UNKNOWN_BASE_GAME = 'Unknown Base Game'
+PLACEHOLDER_BASE_GAME = 'Fetching...'
+NAME_CACHE_FILE_NAME = 'base-game-names.json'
+
+# Function to normalize title IDs
+def normalize_title_id(tid):
+    return tid.strip().lower()
+
+# Function to decrement the 13th character in the TID by one
+def decrement_13th_character(tid):
+    char_13 = tid[12]
+    if char_13.isdigit():
+        new_char_13 = str(int(char_13) - 1)
+    else:
+        new_char_13 = chr(ord(char_13) - 1)
+    return tid[:12] + new_char_13 + '000'
+
+# Asynchronous function to fetch game name from tinfoil.io
+async def fetch_game_name(session, base_tid):
+    url = f"https://api.nlib.cc/nx/{base_tid}"
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json()
+            base_game_name = data.get("name", UNKNOWN_BASE_GAME)
+            logger.debug(f"Fetched base game name for {base_tid}: {base_game_name}")
+            return base_tid, base_game_name
+    except Exception as e:
+        logger.error(f"Error fetching game name for {base_tid}: {e}")
+        return base_tid, UNKNOWN_BASE_GAME
+
+# Asynchronous function to fetch game names from a priority queue until it is empty or the time budget runs out
+async def fetch_all_game_names(prioritized_base_tids, time_budget=None, concurrency=32, request_timeout=20):
+    import aiohttp
+
+    queue = asyncio.PriorityQueue()
+    for priority, base_tid in enumerate(prioritized_base_tids):
+        queue.put_nowait((priority, base_tid))
+
+    game_names = {}
+
+    async def worker(session):
+        while not queue.empty():
+            priority, base_tid = queue.get_nowait()
+            base_tid, game_name = await fetch_game_name(session, base_tid)
+            game_names[base_tid] = game_name
+
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(min(concurrency, queue.qsize()))]
+        if workers:
+            done, pending = await asyncio.wait(workers, timeout=time_budget)
+            # Requests still running at the deadline are dropped and left for a later run or the backfill
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if pending:
+                logger.warning(f"Name resolution budget of {time_budget}s exhausted, {queue.qsize() + len(pending)} base games left unresolved.")
+    return game_names
+
+# Function to load the cache of resolved base game names
+def load_name_cache(data_directory):
+    try:
+        with open(os.path.join(data_directory, NAME_CACHE_FILE_NAME), 'r', encoding='utf-8') as cache_file:
+            return json.load(cache_file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        logger.error(f"Error reading base game name cache: {e}")
+        return {}
+
+# Function to save the cache of resolved base game names
+def save_name_cache(data_directory, name_cache):
+    cache_file_path = os.path.join(data_directory, NAME_CACHE_FILE_NAME)
+    tmp_file_path = cache_file_path + '.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(dict(sorted(name_cache.items())), cache_file, indent=4, ensure_ascii=False)
+    os.replace(tmp_file_path, cache_file_path)
+
+# Function to resolve base game names, newest releases first, reusing and updating the name cache
+def resolve_base_game_names(data_directory, missing_dlcs, time_budget):
+    # Parallel requests and per-request timeout in seconds
+    concurrency = int(os.getenv('NAME_RESOLUTION_CONCURRENCY') or 32)
+    request_timeout = float(os.getenv('NAME_REQUEST_TIMEOUT') or 20)
+
+    name_cache = load_name_cache(data_directory)
+
+    # Prioritize each uncached base game by the newest release date among its missing DLCs
+    newest_release = {}
+    for dlc in missing_dlcs:
+        base_tid = decrement_13th_character(dlc.title_id)
+        if base_tid not in name_cache:
+            newest_release[base_tid] = max(newest_release.get(base_tid, ''), dlc.release_date or '')
+    prioritized_base_tids = sorted(newest_release, key=lambda base_tid: newest_release[base_tid], reverse=True)
+    logger.info(f"{len(name_cache)} base game names cached, {len(prioritized_base_tids)} to fetch.")
+
+    fetched_game_names = asyncio.run(fetch_all_game_names(prioritized_base_tids, time_budget, concurrency, request_timeout))
+
+    # Only real names are cached so failed lookups are retried on the next run
+    for base_tid, game_name in fetched_game_names.items():
+        if game_name != UNKNOWN_BASE_GAME:
+            name_cache[base_tid] = game_name
+    save_name_cache(data_directory, name_cache)
+
+    # Base games not reached before the deadline keep the placeholder until a later run resolves them
+    for dlc in missing_dlcs:
+        base_tid = decrement_13th_character(dlc.title_id)
+        dlc.base_game = name_cache.get(base_tid) or fetched_game_names.get(base_tid, PLACEHOLDER_BASE_GAME)
+
+# Function to write the missing DLC outputs and stats
+def write_missing_dlcs(data_directory, missing_dlcs):
+    # Keep the prices joined by the prices stage until it runs again
+    apply_cached_prices(data_directory, missing_dlcs.values())
+
+    # Write missing-dlcs.json and missing-dlcs.txt
+    missing_dlcs_json_file_path, missing_dlcs_txt_file_path = write_records(data_directory, 'missing-dlcs', missing_dlcs.values())
+    logger.info(f"Missing DLCs saved to {missing_dlcs_json_file_path} and {missing_dlcs_txt_file_path}")
+
+    # Update the stats manifest with the missing DLCs aggregates, including counts per resolved base game
+    write_stats(data_directory, 'missing-dlcs', build_stats(
+        missing_dlcs.values(), date_key='release_date', size_key='size', group_key='base_game',
+        ignored_groups=(PLACEHOLDER_BASE_GAME, UNKNOWN_BASE_GAME)
+    ))
+
+# Function to find missing DLCs by comparing titles_db.json with working.txt
+def find_missing_dlcs_with_base_names(data_directory):
+    with dlcs_lock(data_directory):
+        # Load titles_db.json
+        json_file_path = os.path.join(data_directory, 'titles_db.json')
+        with open(json_file_path, 'r', encoding='utf-8') as json_file:
+            titles_db = json.load(json_file)
+
+        # Load working.txt
+        working_txt_path = os.path.join(data_directory, 'working.txt')
+        with open(working_txt_path, 'r', encoding='utf-8') as txt_file:
+            working_titles = set(normalize_title_id(line.split('|')[0]) for line in txt_file)
+
+        # Identify missing DLCs
+        missing_dlcs = {}
+
+        for title_id, details in titles_db.items():
+            normalized_title_id = normalize_title_id(title_id)
+            if not normalized_title_id.endswith(('000', '800')) and normalized_title_id not in working_titles:
+                missing_dlcs[normalized_title_id] = DLC(normalized_title_id, details.get("Release Date"), details.get("Title Name"), PLACEHOLDER_BASE_GAME, details.get("size"))
+
+        logger.info(f"Identified {len(missing_dlcs)} missing DLCs to fetch base game names for.")
+
+        # Resolve base game names within the time budget in seconds, newest releases first
+        name_resolution_budget = float(os.getenv('NAME_RESOLUTION_BUDGET') or 300)
+        resolve_base_game_names(data_directory, missing_dlcs.values(), name_resolution_budget)
+
+        # Write the missing DLC outputs and stats
+        write_missing_dlcs(data_directory, missing_dlcs)
+
+        # Append the DLCs that became missing or were resolved since the last run to the history store,
+        # unless titles_db is empty or partial and the DLCs it lacks would be logged as resolved
+        titles_db_complete = load_stats(data_directory).get('titles_db', {}).get('complete', True)
+        if titles_db and titles_db_complete:
+            record_deltas(data_directory, 'missing-dlcs', missing_dlcs.keys())
+        else:
+            logger.warning("titles_db.json is empty or incomplete, history not updated for missing DLCs.")
+
+# Function to fill in the base game names left unresolved by earlier runs, without a time budget
+def backfill_base_game_names(data_directory):
+    # A backfill run from cron skips its turn rather than wait while a nightly stage holds the lock
+    try:
+        with dlcs_lock(data_directory, blocking=False):
+            backfill_unresolved_names(data_directory)
+    except BlockingIOError:
+        logger.warning("missing-dlcs.json is being rewritten by another run, backfill skipped.")
+
+# Function to resolve the base game names still left as placeholders in missing-dlcs.json, run under the DLCs lock
+def backfill_unresolved_names(data_directory):
+    missing_dlcs_json_file_path = os.path.join(data_directory, 'missing-dlcs.json')
+    with open(missing_dlcs_json_file_path, 'r', encoding='utf-8') as json_file:
+        missing_dlcs = {
+            title_id: DLC(title_id, details.get("Release Date"), details.get("dlc_name"), details.get("base_game"), details.get("size"))
+            for title_id, details in json.load(json_file).items()
+        }
+
+    unresolved = [dlc for dlc in missing_dlcs.values() if dlc.base_game in (PLACEHOLDER_BASE_GAME, UNKNOWN_BASE_GAME)]
+    logger.info(f"Backfilling base game names for {len(unresolved)} missing DLCs.")
+    if not unresolved:
+        return
+
+    # Seed the cache with the names already resolved in missing-dlcs.json so they are not fetched again
+    name_cache = load_name_cache(data_directory)
+    for dlc in missing_dlcs.values():
+        if dlc.base_game not in (PLACEHOLDER_BASE_GAME, UNKNOWN_BASE_GAME):
+            name_cache.setdefault(decrement_13th_character(dlc.title_id), dlc.base_game)
+    save_name_cache(data_directory, name_cache)
+
+    # Only the DLCs still left with a placeholder or unknown name are queued
+    resolve_base_game_names(data_directory, unresolved, None)
+    write_missing_dlcs(data_directory, missing_dlcs)
@@ -0,0 +1,133 @@
+import os
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+# Files of the history store, kept next to the other data files
+HISTORY_DIR_NAME = 'history'
+LOG_FILE_NAME = 'deltas.txt'
+TID_INDEX_FILE_NAME = 'index-tids.json'
+RUN_INDEX_FILE_NAME = 'index-runs.json'
+STATE_FILE_NAME = 'state.json'
+
+# Function to get the timestamp of the current run, shared by all stages when main.py sets NX_RUN_TIMESTAMP
+def run_timestamp():
+    return os.getenv('NX_RUN_TIMESTAMP') or datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+# Function to load a JSON file of the history store, returning a default if it does not exist yet
+def load_json(file_path, default):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as json_file:
+            return json.load(json_file)
+    except FileNotFoundError:
+        return default
+
+# Function to serialize JSON with one item per line down to `depth` levels, so each run changes few lines in git
+def dump_lines(data, depth):
+    if depth == 0 or not isinstance(data, (dict, list)) or not data:
+        return json.dumps(data, separators=(',', ':'))
+    if isinstance(data, dict):
+        items = [f"{json.dumps(key)}:{dump_lines(value, depth - 1)}" for key, value in data.items()]
+        return '{\n' + ',\n'.join(items) + '\n}'
+    return '[\n' + ',\n'.join(dump_lines(item, depth - 1) for item in data) + '\n]'
+
+# Function to write a JSON file of the history store atomically
+def save_json(file_path, data, depth=1):
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as json_file:
+        json_file.write(dump_lines(data, depth) + '\n')
+    os.replace(tmp_path, file_path)
+
+# Function to append the added/resolved deltas of one content type to the history store
+# Each key is a TID, or a (TID, version) pair for content types tracked per version such as old updates
+def record_deltas(data_directory, content_type, current_keys, timestamp=None):
+    timestamp = timestamp or run_timestamp()
+    history_directory = os.path.join(data_directory, HISTORY_DIR_NAME)
+    os.makedirs(history_directory, exist_ok=True)
+    log_path = os.path.join(history_directory, LOG_FILE_NAME)
+    tid_index_path = os.path.join(history_directory, TID_INDEX_FILE_NAME)
+    run_index_path = os.path.join(history_directory, RUN_INDEX_FILE_NAME)
+    state_path = os.path.join(history_directory, STATE_FILE_NAME)
+
+    state = load_json(state_path, {})
+
+    def to_key(key):
+        return '|'.join(key) if isinstance(key, tuple) else f"{key}|"
+
+    current = {to_key(key).lower() for key in current_keys}
+
+    previous = set(state.get(content_type, []))
+
+    # The first run of a content type only seeds its state: what is missing then did not become missing at that time
+    if content_type not in state:
+        state[content_type] = sorted(current)
+        save_json(state_path, state, depth=2)
+        print(f"History for {content_type}: seeded with {len(current)} entries.")
+        return 0, 0
+
+    added = sorted(current - previous)
+    resolved = sorted(previous - current)
+
+    if added or resolved:
+        # The TID index maps each TID to the offsets of its records; the run index maps each run to its slice of the log
+        tid_index = load_json(tid_index_path, {})
+        runs = load_json(run_index_path, [])
+
+        # Records are "timestamp|content type|tid|version|event", one per line, appended in run order
+        with open(log_path, 'ab') as log_file:
+            offset = log_file.tell()
+            start_offset = offset
+            for event, keys in (("added", added), ("resolved", resolved)):
+                for key in keys:
+                    line = f"{timestamp}|{content_type}|{key}|{event}\n".encode('utf-8')
+                    log_file.write(line)
+                    tid_index.setdefault(key.split('|')[0], []).append(offset)
+                    offset += len(line)
+
+        # Runs are appended in time order, so a time range maps to one contiguous slice of the log
+        if runs and runs[-1][0] == timestamp:
+            runs[-1][2] = offset
+        else:
+            runs.append([timestamp, start_offset, offset])
+        save_json(tid_index_path, tid_index)
+        save_json(run_index_path, runs)
+
+    state[content_type] = sorted(current)
+    save_json(state_path, state, depth=2)
+    print(f"History for {content_type}: {len(added)} added, {len(resolved)} resolved.")
+    return len(added), len(resolved)
+
+# Function to parse one record line of the history log
+def parse_record(line):
+    timestamp, content_type, tid, version, event = line.decode('utf-8').rstrip('\n').split('|')
+    return {"Timestamp": timestamp, "Type": content_type, "TID": tid, "Version": version or None, "Event": event}
+
+# Function to get every delta recorded for a TID, oldest first
+def query_tid(data_directory, tid):
+    history_directory = os.path.join(data_directory, HISTORY_DIR_NAME)
+    offsets = load_json(os.path.join(history_directory, TID_INDEX_FILE_NAME), {}).get(tid.strip().lower(), [])
+    if not offsets:
+        return []
+
+    records = []
+    with open(os.path.join(history_directory, LOG_FILE_NAME), 'rb') as log_file:
+        for offset in offsets:
+            log_file.seek(offset)
+            records.append(parse_record(log_file.readline()))
+    return records
+
+# Function to get every delta recorded between two timestamps (inclusive, ISO format or a date prefix)
+def query_range(data_directory, start, end):
+    history_directory = os.path.join(data_directory, HISTORY_DIR_NAME)
+    runs = load_json(os.path.join(history_directory, RUN_INDEX_FILE_NAME), [])
+    timestamps = [run[0] for run in runs]
+    # A date-only end bound covers the whole day
+    first = bisect_left(timestamps, start)
+    last = bisect_right(timestamps, end + 'T23:59:59' if len(end) == 10 else end)
+    if first >= last:
+        return []
+
+    with open(os.path.join(history_directory, LOG_FILE_NAME), 'rb') as log_file:
+        log_file.seek(runs[first][1])
+        data = log_file.read(runs[last - 1][2] - runs[first][1])
+    return [parse_record(line) for line in data.splitlines(keepends=True)]
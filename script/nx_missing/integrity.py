@@ -0,0 +1,131 @@
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+
+# Size of each slice fed to the hash from the memory-mapped file
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# Offsets used by the header checks
+PFS0_MAGIC = b'PFS0'
+XCI_MAGIC = b'HEAD'
+XCI_MAGIC_OFFSET = 0x100
+XCI_VALID_DATA_END_OFFSET = 0x118
+XCI_MEDIA_UNIT = 0x200
+
+# Function to build the cache key of a file from its stat result
+def cache_key(stat_result):
+    return f"{stat_result.st_dev}:{stat_result.st_ino}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+
+# Function to load the hash cache, returning an empty cache if it does not exist yet
+def load_hash_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            return json.load(cache_file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error reading hash cache {cache_path}: {e}")
+        return {}
+
+# Function to save the hash cache atomically
+def save_hash_cache(cache_path, cache):
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(tmp_path, cache_path)
+
+# Function to check the container header and return an error message, or None if the file looks complete
+def check_header(mapped, file_size, file_type):
+    if file_type in ('nsp', 'nsz'):
+        # PFS0: magic, file count, string table size, then 0x18-byte file entries (offset, size, name offset, padding)
+        if file_size < 0x10 or mapped[:4] != PFS0_MAGIC:
+            return "invalid PFS0 header"
+        file_count, string_table_size = struct.unpack_from('<II', mapped, 4)
+        header_size = 0x10 + file_count * 0x18 + string_table_size
+        if header_size > file_size:
+            return "truncated PFS0 header"
+        data_end = 0
+        for index in range(file_count):
+            offset, size = struct.unpack_from('<QQ', mapped, 0x10 + index * 0x18)
+            data_end = max(data_end, offset + size)
+        if header_size + data_end > file_size:
+            return f"truncated: expected {header_size + data_end} bytes, found {file_size}"
+    elif file_type in ('xci', 'xcz'):
+        if file_size < XCI_VALID_DATA_END_OFFSET + 4 or mapped[XCI_MAGIC_OFFSET:XCI_MAGIC_OFFSET + 4] != XCI_MAGIC:
+            return "invalid XCI header"
+        # XCZ payloads are compressed, so only plain XCI files can be checked against the valid data end
+        if file_type == 'xci':
+            valid_data_end, = struct.unpack_from('<I', mapped, XCI_VALID_DATA_END_OFFSET)
+            expected_size = (valid_data_end + 1) * XCI_MEDIA_UNIT
+            if expected_size > file_size:
+                return f"truncated: expected {expected_size} bytes, found {file_size}"
+    return None
+
+# Function to hash a single file, run inside the process pool
+def hash_file(file_path, file_type):
+    try:
+        with open(file_path, 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            digest = hashlib.sha256()
+            if file_size == 0:
+                return file_path, digest.hexdigest(), 0, "empty file"
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                error = check_header(mapped, file_size, file_type)
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, file_size, CHUNK_SIZE):
+                        digest.update(view[offset:offset + CHUNK_SIZE])
+                finally:
+                    view.release()
+            return file_path, digest.hexdigest(), file_size, error
+    except (OSError, ValueError, struct.error) as e:
+        return file_path, None, 0, f"unreadable: {e}"
+
+# Function to verify a list of files, returning {file_path: {"SHA256", "Error"}} and reusing cached digests
+def verify_files(file_entries, cache_path, max_workers=None):
+    # Imported here as multiprocessing is only needed when the integrity check is enabled
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache = load_hash_cache(cache_path)
+    # Only entries for files seen in this run are kept, so deleted or modified files drop out of the cache
+    new_cache = {}
+    results = {}
+    to_hash = {}
+
+    for file_path, file_type in file_entries:
+        try:
+            key = cache_key(os.stat(file_path))
+        except OSError as e:
+            results[file_path] = {"SHA256": None, "Error": f"unreadable: {e}"}
+            continue
+        if key in cache:
+            results[file_path] = new_cache[key] = cache[key]
+        else:
+            to_hash[file_path] = (key, file_type)
+
+    print(f"Integrity check: {len(new_cache)} cached, {len(to_hash)} to hash.")
+
+    hashed_bytes = 0
+    start_time = time.perf_counter()
+    if to_hash:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            paths = list(to_hash)
+            types = [to_hash[path][1] for path in paths]
+            for file_path, digest, file_size, error in executor.map(hash_file, paths, types):
+                result = {"SHA256": digest, "Error": error}
+                results[file_path] = result
+                hashed_bytes += file_size
+                # Unreadable files are retried next run instead of being cached
+                if digest is not None:
+                    new_cache[to_hash[file_path][0]] = result
+    elapsed = time.perf_counter() - start_time
+
+    if to_hash:
+        throughput = hashed_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        print(f"Hashed {hashed_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s ({throughput:.1f} MB/s).")
+    save_hash_cache(cache_path, new_cache)
+
+    return results
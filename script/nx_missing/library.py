@@ -0,0 +1,114 @@
+import os
+import re
+import socket
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .config import SCRIPT_DIRECTORY, env_flag
+from .manifest import write_partial_manifest, write_working_files
+
+# Regex pattern
+pattern = re.compile(r'^(?P<game_name>.+?) (?:[\[\(].*?[\]\)])*\[(?P<titleid>[0-9A-Fa-f]+)\]\[v(?P<version>\d+)\]\.(?P<type>nsp|nsz|xci|xcz)$')
+
+# Function to process a single file
+def process_file(file_path, filename):
+    match = pattern.match(filename)
+    if match:
+        game_name = match.group('game_name')
+        titleid = match.group('titleid')
+        version = match.group('version')
+
+        # Get file size with error handling
+        try:
+            file_size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            print(f"Error: File not found or inaccessible: {file_path}")
+            return None
+        except OSError as e:
+            print(f"Error: OS error occurred for file {file_path}: {e}")
+            return None
+
+        # Print file processing info
+        print(f"Processed {filename}: ID = {titleid}, Version = {version}, Size = {file_size} bytes")
+
+        return {
+            "Title ID": titleid,
+            "Game Name": game_name,
+            "Version": version,
+            "Size": file_size,
+            "Type": match.group('type'),
+            "Path": file_path
+        }
+    return None
+
+# Function to walk one root folder and process its files in a thread pool, so slow stats on network mounts overlap
+def walk_root(root_path):
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(process_file, os.path.join(root, filename), filename)
+            for root, dirs, files in os.walk(root_path)
+            # Only process files that match the specified pattern
+            for filename in files if pattern.match(filename)
+        ]
+        records = [record for record in (future.result() for future in futures) if record]
+    print(f"Scanned {root_path}: {len(records)} files.")
+    return records
+
+# Async function to walk all root folders in parallel
+async def walk_and_process(folder_paths):
+    loop = asyncio.get_event_loop()
+    with ThreadPoolExecutor(max_workers=len(folder_paths)) as executor:
+        tasks = [loop.run_in_executor(executor, walk_root, root_path) for root_path in folder_paths]
+        results = await asyncio.gather(*tasks)
+    return [record for records in results for record in records]
+
+# Function to hash every scanned file and record corrupt dumps on the file records
+# Duplicates are detected when the records are merged, so copies held by different hosts are found too
+def check_integrity(records, hash_cache_path, integrity_workers=None):
+    # Imported here so the hashing code is only loaded when the integrity check is enabled
+    from .integrity import verify_files
+
+    results = verify_files([(record["Path"], record["Type"]) for record in records], hash_cache_path, integrity_workers)
+
+    corrupt_count = 0
+    for record in sorted(records, key=lambda record: record["Path"]):
+        result = results[record["Path"]]
+        record["SHA256"] = result["SHA256"]
+        record["Status"] = "ok"
+
+        if result["Error"]:
+            record["Status"] = "corrupt"
+            record["Error"] = result["Error"]
+            corrupt_count += 1
+            print(f"Corrupt file {record['Path']}: {result['Error']}")
+
+    print(f"Integrity check complete: {corrupt_count} corrupt files.")
+
+# Function to scan the library folders and write the working files, or this host's partial manifest
+def scan_library(data_directory):
+    # Récupérer le chemin du dossier depuis le .env (plusieurs racines séparées par os.pathsep)
+    folder_path = os.getenv('FOLDER_PATH')
+    if not folder_path:
+        raise ValueError("FOLDER_PATH is not set in the .env file.")
+    folder_paths = [path for path in folder_path.split(os.pathsep) if path.strip()]
+    if not folder_paths:
+        raise ValueError("FOLDER_PATH does not contain any folder.")
+
+    print(f"Starting to scan files in folders {', '.join(folder_paths)}...")
+    records = asyncio.run(walk_and_process(folder_paths))
+
+    # Optional integrity check: hash every file and flag corrupt or duplicate dumps
+    if env_flag('INTEGRITY_CHECK'):
+        hash_cache_path = os.getenv('HASH_CACHE_PATH') or os.path.join(SCRIPT_DIRECTORY, 'hash_cache.json')
+        integrity_workers = int(os.getenv('INTEGRITY_WORKERS') or 0) or None
+        check_integrity(records, hash_cache_path, integrity_workers)
+
+    # Storage nodes only write their partial manifest; the merge step writes the working files.
+    # A coordinator that also holds a library adds its own manifest to the ones it merges
+    partial_manifest_dir = os.getenv('PARTIAL_MANIFEST_DIR') or os.getenv('MERGE_MANIFEST_DIR')
+    if partial_manifest_dir:
+        host_name = os.getenv('HOST_NAME') or socket.gethostname()
+        write_partial_manifest(partial_manifest_dir, host_name, folder_paths, records)
+    else:
+        write_working_files(data_directory, records)
+
+    print("Processing complete.")
@@ -0,0 +1,45 @@
+import os
+import time
+from contextlib import contextmanager
+
+# Lock file in the data directory shared by every stage that rewrites missing-dlcs.json or base-game-names.json
+DLC_LOCK_FILE_NAME = '.missing-dlcs.lock'
+
+# Function to lock an open file, raising BlockingIOError when it is held elsewhere and blocking is False
+def lock_file(file, blocking):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        # msvcrt locks bytes from the current position, so always lock the first byte
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if not blocking:
+                    raise BlockingIOError("lock is held by another process")
+                time.sleep(1)
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+
+# Function to unlock a file locked by lock_file
+def unlock_file(file):
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+# Context manager holding the missing DLCs lock, so the nightly stages and a backfill never overwrite each other
+@contextmanager
+def dlcs_lock(data_directory, blocking=True):
+    with open(os.path.join(data_directory, DLC_LOCK_FILE_NAME), 'a+') as file:
+        lock_file(file, blocking)
+        try:
+            yield
+        finally:
+            unlock_file(file)
@@ -0,0 +1,156 @@
+import os
+import json
+import glob
+from datetime import datetime
+from .stats import build_stats, write_stats
+
+# Fields of a file record that are written to working.json
+WORKING_FIELDS = ("Game Name", "Version", "Size", "SHA256", "Status", "Error", "Duplicate Of")
+
+# Function to write the partial manifest of one host so it can be merged later
+def write_partial_manifest(manifest_directory, host, roots, records):
+    os.makedirs(manifest_directory, exist_ok=True)
+    manifest_path = os.path.join(manifest_directory, f"{host}.json")
+    manifest = {
+        "Host": host,
+        "Roots": roots,
+        "Generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "Files": records
+    }
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+    print(f"Partial manifest {manifest_path} generated with {len(records)} files.")
+    return manifest_path
+
+# Function to load the file records of every partial manifest in a directory
+def load_partial_manifests(manifest_directory):
+    records = []
+    for manifest_path in sorted(glob.glob(os.path.join(manifest_directory, '*.json'))):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except json.JSONDecodeError as e:
+            print(f"Error reading partial manifest {manifest_path}: {e}")
+            continue
+        files = manifest.get("Files", [])
+        # Tag each file with its host so paths and duplicates can be told apart across hosts
+        for record in files:
+            record["Host"] = manifest.get("Host")
+        print(f"Loaded {len(files)} files from {manifest.get('Host', manifest_path)} (generated {manifest.get('Generated')}).")
+        records.extend(files)
+    return records
+
+# Function to get the location of a file record, prefixed with its host when it comes from a partial manifest
+def record_location(record):
+    return f"{record['Host']}:{record['Path']}" if record.get("Host") else record["Path"]
+
+# Function to mark the hashed files whose content was already seen, across every root and host
+def mark_duplicates(records):
+    seen_digests = {}
+    duplicate_count = 0
+    for record in sorted(records, key=record_location):
+        if record.get("Status") != "ok" or not record.get("SHA256"):
+            continue
+        if record["SHA256"] in seen_digests:
+            record["Status"] = "duplicate"
+            original = seen_digests[record["SHA256"]]
+            # working.json is published, so it only names the original file; the full location is only logged
+            record["Duplicate Of"] = os.path.basename(original["Path"])
+            duplicate_count += 1
+            print(f"Duplicate file {record_location(record)} of {record_location(original)}")
+        else:
+            seen_digests[record["SHA256"]] = record
+    return duplicate_count
+
+# Function to merge file records from any number of roots or hosts into working.txt and working.json content
+def merge_records(records):
+    working_versions = set()
+    json_content = {}
+    # Every flagged file is listed under its title ID, not only the one picked for the entry,
+    # by file name only so the published working.json does not expose the storage layout of the hosts
+    flagged_files = {}
+
+    duplicate_count = mark_duplicates(records)
+
+    for record in records:
+        titleid = record["Title ID"]
+        corrupt = record.get("Status") == "corrupt"
+        duplicate = record.get("Status") == "duplicate"
+
+        # A corrupt dump does not count as working content
+        if not corrupt:
+            working_versions.add((titleid, int(record["Version"])))
+
+        if corrupt:
+            flagged_files.setdefault(titleid, {}).setdefault("Corrupt", []).append(
+                {"File": os.path.basename(record["Path"]), "Version": record["Version"], "Error": record.get("Error")}
+            )
+        elif duplicate:
+            flagged_files.setdefault(titleid, {}).setdefault("Duplicates", []).append(
+                {"File": os.path.basename(record["Path"]), "Version": record["Version"], "Duplicate Of": record["Duplicate Of"]}
+            )
+
+        # Keep the highest version of each title ID, then the largest file, preferring healthy original dumps
+        rank = (not corrupt, not duplicate, int(record["Version"]), record["Size"])
+        current = json_content.get(titleid)
+        if current is None or rank > current[0]:
+            json_content[titleid] = (rank, record)
+
+    txt_content = [f"{titleid}|{version}" for titleid, version in sorted(working_versions)]
+    json_content = {
+        titleid: {
+            **{field: record[field] for field in WORKING_FIELDS if field in record},
+            **{key: sorted(files, key=lambda file: file["File"]) for key, files in sorted(flagged_files.get(titleid, {}).items())}
+        }
+        for titleid, (rank, record) in sorted(json_content.items())
+    }
+    if flagged_files:
+        corrupt_count = sum(len(files.get("Corrupt", [])) for files in flagged_files.values())
+        print(f"Merged {len(records)} files: {corrupt_count} corrupt, {duplicate_count} duplicate.")
+    return txt_content, json_content
+
+# Function to write working.txt, working.json and the working stats from merged file records
+def write_working_files(data_directory, records):
+    txt_content, json_content = merge_records(records)
+    os.makedirs(data_directory, exist_ok=True)
+
+    # Write working.txt file
+    txt_file_path = os.path.join(data_directory, 'working.txt')
+    with open(txt_file_path, 'w') as txt_file:
+        txt_file.write('\n'.join(txt_content))
+    print(f"File {txt_file_path} generated successfully.")
+
+    # Write working.json file
+    json_file_path = os.path.join(data_directory, 'working.json')
+    with open(json_file_path, 'w') as json_file:
+        json.dump(json_content, json_file, indent=4)
+    print(f"File {json_file_path} generated successfully.")
+
+    # Update the stats manifest with the working content aggregates
+    healthy_entries = [entry for entry in json_content.values() if entry.get("Status") != "corrupt"]
+    working_stats = build_stats(healthy_entries, date_key=None, size_key='Size')
+    working_stats["count"] = len(txt_content)
+    working_stats["titles"] = len(json_content)
+    write_stats(data_directory, 'working', working_stats)
+
+# Function to merge the partial manifests of every storage node into the working files
+def merge_partial_manifests(data_directory, manifest_directory):
+    records = load_partial_manifests(manifest_directory)
+    if not records:
+        print(f"No partial manifests found in {manifest_directory}.")
+        return False
+
+    write_working_files(data_directory, records)
+    print("Merge complete.")
+    return True
+
+# Function to merge the partial manifests of MERGE_MANIFEST_DIR, run by the coordinator instead of a scan
+def merge_library(data_directory):
+    manifest_directory = os.getenv('MERGE_MANIFEST_DIR')
+    if not manifest_directory:
+        raise ValueError("MERGE_MANIFEST_DIR is not set in the .env file.")
+    # Later stages would read a stale working.txt, so a merge with nothing to merge fails the run
+    if not merge_partial_manifests(data_directory, manifest_directory):
+        raise ValueError(f"No partial manifests to merge in {manifest_directory}.")
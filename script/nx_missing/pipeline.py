@@ -0,0 +1,128 @@
+import os
+import subprocess
+import traceback
+from datetime import datetime
+from .stats import load_stats
+
+# Function to check whether this host only writes its partial manifest and leaves the other stages to the coordinator
+def is_storage_node():
+    return bool(os.getenv('PARTIAL_MANIFEST_DIR')) and not os.getenv('MERGE_MANIFEST_DIR')
+
+# Function to get the pipeline stages in order; each one is imported only when it runs
+def pipeline_stages():
+    from .library import scan_library
+    from .manifest import merge_library
+    from .titles import update_titles
+    from .updates import find_missing_updates
+    from .dlcs import find_missing_dlcs_with_base_names
+    from .prices import update_prices
+
+    # A coordinator builds the working files by merging the storage nodes' manifests;
+    # it only scans too when it also holds a library of its own
+    library_stages = []
+    if os.getenv('FOLDER_PATH') or not os.getenv('MERGE_MANIFEST_DIR'):
+        library_stages.append(('list', scan_library))
+    if os.getenv('MERGE_MANIFEST_DIR'):
+        library_stages.append(('merge', merge_library))
+
+    # A storage node's working.txt is never rebuilt, so the later stages would run against stale data
+    if is_storage_node():
+        return library_stages
+
+    return library_stages + [
+        ('titles', update_titles),
+        ('updates', find_missing_updates),
+        ('dlcs', find_missing_dlcs_with_base_names),
+        ('prices', update_prices)
+    ]
+
+# Function to get the entry count of a section from the stats manifest written by the stages
+def count_entries_in_stats(stats, section):
+    if section not in stats:
+        print(f"Section {section} not found in stats manifest.")
+        return 0
+    entry_count = stats[section].get("count", 0)
+    print(f"Section {section} contains {entry_count} entries.")
+    return entry_count
+
+# Function to build the commit message from the stats manifest instead of re-parsing the output files
+def build_commit_message(data_directory):
+    stats = load_stats(data_directory)
+    updates_count = count_entries_in_stats(stats, 'missing-updates')
+    titles_count = count_entries_in_stats(stats, 'missing-titles')
+    dlcs_count = count_entries_in_stats(stats, 'missing-dlcs')
+    working_count = count_entries_in_stats(stats, 'working')
+
+    # Calculate total entries
+    total_entries = updates_count + titles_count + dlcs_count
+
+    return (
+        f"Update data files on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        f"Current content count:\n"
+        f"missing updates: {updates_count} entries\n"
+        f"missing titles: {titles_count} entries\n"
+        f"missing dlcs: {dlcs_count} entries\n"
+        f"Total Missing Content: {total_entries} entries\n"
+        f"Total Working Content: {working_count} entries\n"
+    )
+
+# Function to push changes to GitHub using SSH
+def push_changes(data_directory, commit_message):
+    try:
+        # Add modified files to the git staging area
+        subprocess.run(['git', '-C', data_directory, 'add', data_directory], check=True)
+        # Commit the changes with a detailed message
+        subprocess.run(['git', '-C', data_directory, 'commit', '-m', commit_message], check=True)
+        # Push the changes to the remote repository using SSH
+        subprocess.run(['git', '-C', data_directory, 'push', 'origin', 'main'], check=True)
+        print("\nChanges pushed to GitHub successfully.")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error pushing changes to GitHub: {e.stderr}")
+        return False
+
+# Function to run every stage in this process, then commit and push the data directory if it changed
+def run_all(data_directory, push=True):
+    # Share one run timestamp with every stage so their history records are grouped under the same run
+    os.environ['NX_RUN_TIMESTAMP'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+    # Execute each stage in order
+    for stage_name, stage in pipeline_stages():
+        print(f"\nRunning {stage_name}...")
+        try:
+            stage(data_directory)
+        except Exception:
+            print(f"Error running {stage_name}:\n{traceback.format_exc()}")
+            return False
+
+    print("\nAll stages executed successfully.")
+
+    # A storage node has nothing to commit; the coordinator merges its manifest and pushes the data files
+    if is_storage_node():
+        print("Storage node: partial manifest written, the other stages run on the coordinator.")
+        return True
+
+    commit_message = build_commit_message(data_directory)
+    if not push:
+        print(f"\n{commit_message}")
+        return True
+
+    # Check for changes and push if there are any
+    print("\nChecking for changes in the data directory...")
+    try:
+        result = subprocess.run(
+            ['git', '-C', data_directory, 'status', '--porcelain', data_directory],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Error checking for changes: {e.stderr}")
+        return False
+
+    if result.stdout.strip():
+        print("\nChanges detected. Pushing to GitHub...")
+        return push_changes(data_directory, commit_message)
+
+    print("\nNo changes detected. No push needed.")
+    return True
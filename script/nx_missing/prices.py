@@ -0,0 +1,230 @@
+import json
+import os
+import logging
+import asyncio
+from datetime import datetime, timedelta
+from .history import run_timestamp
+from .records import DLC, Title, write_records
+from .locks import dlcs_lock
+
+logger = logging.getLogger(__name__)
+
+# Cache of the prices fetched so far, keyed by title ID
+PRICE_CACHE_FILE_NAME = 'prices.json'
+# Legacy price list, one "Name - Price (Region: XX)" line per missing title
+PRICES_TXT_FILE_NAME = 'titles_prices.txt'
+# eShop price endpoint; PRICE_API_URL can point it at a local stand-in
+DEFAULT_PRICE_API_URL = 'https://api.ec.nintendo.com/v1/price'
+# The price endpoint accepts at most 50 ids per request
+MAX_BATCH_SIZE = 50
+
+# Function to get the fingerprint of a record; a TID is re-queried when its fingerprint changes
+def price_fingerprint(record):
+    name = record.title_name if isinstance(record, Title) else record.dlc_name
+    return f"{record.release_date}|{name}"
+
+# Function to check whether a cached entry is an unpriced title old enough to be looked up again,
+# since titledb may have gained its nsuId or the eShop its price since then
+def retry_due(entry, retry_after):
+    if entry.get("price"):
+        return False
+    try:
+        return datetime.fromisoformat(entry["fetched"]) + retry_after <= datetime.fromisoformat(run_timestamp())
+    except (KeyError, TypeError, ValueError):
+        return True
+
+# Function to load the price cache
+def load_price_cache(data_directory):
+    try:
+        with open(os.path.join(data_directory, PRICE_CACHE_FILE_NAME), 'r', encoding='utf-8') as cache_file:
+            return json.load(cache_file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        logger.error(f"Error reading price cache: {e}")
+        return {}
+
+# Function to save the price cache
+def save_price_cache(data_directory, price_cache):
+    cache_file_path = os.path.join(data_directory, PRICE_CACHE_FILE_NAME)
+    tmp_file_path = cache_file_path + '.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(dict(sorted(price_cache.items())), cache_file, indent=4, ensure_ascii=False)
+    os.replace(tmp_file_path, cache_file_path)
+
+# Function to set the cached price on each record, without any network request
+def apply_cached_prices(data_directory, records, price_cache=None):
+    if price_cache is None:
+        price_cache = load_price_cache(data_directory)
+    for record in records:
+        entry = price_cache.get(record.title_id.upper())
+        record.price = entry.get("price") if entry else None
+
+# Function to load the missing titles and DLCs written by the earlier stages
+def load_missing_records(data_directory):
+    with open(os.path.join(data_directory, 'missing-titles.json'), 'r', encoding='utf-8') as json_file:
+        missing_titles = [
+            Title(title_id, details.get("Release Date"), details.get("Title Name"), details.get("size"))
+            for title_id, details in json.load(json_file).items()
+        ]
+    with open(os.path.join(data_directory, 'missing-dlcs.json'), 'r', encoding='utf-8') as json_file:
+        missing_dlcs = [
+            DLC(title_id, details.get("Release Date"), details.get("dlc_name"), details.get("base_game"), details.get("size"))
+            for title_id, details in json.load(json_file).items()
+        ]
+    return missing_titles, missing_dlcs
+
+# Function to download the titledb file of the price region and map each title ID to its eShop nsuId,
+# returning None when it cannot be loaded so the stage carries on with the cached prices
+def load_nsuids(region, language):
+    import requests
+    from .titles import base_url
+
+    url = os.getenv('PRICE_TITLEDB_URL') or f"{base_url}{region}.{language}.json"
+    logger.info(f"Downloading {url} to map title IDs to nsuIds...")
+    try:
+        response = requests.get(url, timeout=120)
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Error downloading {url}: {e}")
+        return None
+    return {
+        details["id"].upper(): details["nsuId"]
+        for details in data.values()
+        if details.get("id") and details.get("nsuId")
+    }
+
+# Function to parse the reply of the price endpoint into a price per nsuId, raising on a malformed reply
+def parse_prices(data):
+    prices = {}
+    for entry in data["prices"]:
+        regular_price = entry.get("regular_price")
+        if regular_price and regular_price.get("raw_value"):
+            prices[int(entry["title_id"])] = f"{regular_price['raw_value']} {regular_price['currency']}"
+        else:
+            prices[int(entry["title_id"])] = None
+    return prices
+
+# Asynchronous function to fetch the prices of one batch of nsuIds; a failed or malformed batch
+# returns no prices, so it stays out of the cache and is retried on the next run
+async def fetch_price_batch(session, semaphore, api_url, region, language, nsuids):
+    params = {'country': region, 'lang': language, 'ids': ','.join(str(nsuid) for nsuid in nsuids)}
+    async with semaphore:
+        try:
+            async with session.get(api_url, params=params) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+            return parse_prices(data)
+        except Exception as e:
+            logger.error(f"Error fetching prices for {len(nsuids)} titles: {e}")
+            return {}
+
+# Asynchronous function to fetch the prices of every batch, with at most `concurrency` requests in flight
+async def fetch_all_prices(batches, api_url, region, language, concurrency=4, request_timeout=20):
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        results = await asyncio.gather(*(fetch_price_batch(session, semaphore, api_url, region, language, batch) for batch in batches))
+
+    prices = {}
+    for result in results:
+        prices.update(result)
+    return prices
+
+# Function to write the legacy titles_prices.txt from the priced missing titles
+def write_prices_txt(data_directory, missing_titles, price_cache):
+    txt_file_path = os.path.join(data_directory, PRICES_TXT_FILE_NAME)
+    with open(txt_file_path, 'w', encoding='utf-8') as txt_file:
+        for title in missing_titles:
+            entry = price_cache.get(title.title_id.upper())
+            if not entry:
+                continue
+            if entry.get("price"):
+                txt_file.write(f"{title.title_name} - {entry['price']} (Region: {entry['region']})\n")
+            else:
+                txt_file.write(f"Title ID {title.title_id} - N/A  (Region: N/A)\n")
+    return txt_file_path
+
+# Function to fetch the prices of new or changed missing titles and DLCs, and join them into their outputs
+def update_prices(data_directory):
+    # missing-dlcs.json is rewritten with its prices, so the DLC stages and a backfill are kept out meanwhile
+    with dlcs_lock(data_directory):
+        # Price region and language, batch size, parallel requests and per-request timeout in seconds
+        region = os.getenv('PRICE_REGION') or 'US'
+        language = os.getenv('PRICE_LANGUAGE') or 'en'
+        api_url = os.getenv('PRICE_API_URL') or DEFAULT_PRICE_API_URL
+        batch_size = min(int(os.getenv('PRICE_BATCH_SIZE') or MAX_BATCH_SIZE), MAX_BATCH_SIZE)
+        concurrency = int(os.getenv('PRICE_CONCURRENCY') or 4)
+        request_timeout = float(os.getenv('PRICE_REQUEST_TIMEOUT') or 20)
+        # Days before a title without an nsuId or a price is looked up again
+        retry_after = timedelta(days=float(os.getenv('PRICE_RETRY_DAYS') or 7))
+
+        missing_titles, missing_dlcs = load_missing_records(data_directory)
+        price_cache = load_price_cache(data_directory)
+
+        # Only TIDs never priced in this region, whose name or release date changed,
+        # or left unpriced for longer than the retry delay are queried again
+        stale = {}
+        for record in missing_titles + missing_dlcs:
+            title_id = record.title_id.upper()
+            entry = price_cache.get(title_id)
+            fingerprint = price_fingerprint(record)
+            if not entry or entry.get("fingerprint") != fingerprint or entry.get("region") != region or retry_due(entry, retry_after):
+                stale[title_id] = fingerprint
+        logger.info(f"{len(price_cache)} prices cached, {len(stale)} titles to query.")
+
+        if stale:
+            # nsuIds are per region, so only those cached for the current region are reused
+            cached_nsuids = {
+                title_id: price_cache[title_id]["nsuId"]
+                for title_id in stale
+                if price_cache.get(title_id, {}).get("region") == region and price_cache[title_id].get("nsuId")
+            }
+
+            # The titledb region file is only downloaded when a stale TID has no known nsuId yet
+            nsuids = {}
+            if len(cached_nsuids) < len(stale):
+                nsuids = load_nsuids(region, language)
+
+            tids_by_nsuid = {}
+            for title_id in stale:
+                nsuid = cached_nsuids.get(title_id) or (nsuids or {}).get(title_id)
+                if nsuid:
+                    tids_by_nsuid[int(nsuid)] = title_id
+
+            batches = [list(tids_by_nsuid)[index:index + batch_size] for index in range(0, len(tids_by_nsuid), batch_size)]
+            logger.info(f"Fetching prices for {len(tids_by_nsuid)} titles in {len(batches)} batches...")
+            prices = asyncio.run(fetch_all_prices(batches, api_url, region, language, concurrency, request_timeout))
+
+            # TIDs without an nsuId are cached as unpriced until the retry delay is over;
+            # batches that failed are left out of the cache and retried on the next run
+            fetched = run_timestamp()
+            nsuids_by_tid = {title_id: nsuid for nsuid, title_id in tids_by_nsuid.items()}
+            for title_id, fingerprint in stale.items():
+                nsuid = nsuids_by_tid.get(title_id)
+                if nsuid is not None and nsuid not in prices:
+                    continue
+                # Without the titledb file a missing nsuId says nothing about the title, so it is retried too
+                if nsuid is None and nsuids is None:
+                    continue
+                price_cache[title_id] = {
+                    "nsuId": nsuid,
+                    "price": prices.get(nsuid),
+                    "region": region,
+                    "fingerprint": fingerprint,
+                    "fetched": fetched
+                }
+            save_price_cache(data_directory, price_cache)
+
+        # Join the cached prices into the missing titles and DLCs outputs
+        apply_cached_prices(data_directory, missing_titles, price_cache)
+        apply_cached_prices(data_directory, missing_dlcs, price_cache)
+        write_records(data_directory, 'missing-titles', missing_titles)
+        write_records(data_directory, 'missing-dlcs', missing_dlcs)
+
+        txt_file_path = write_prices_txt(data_directory, missing_titles, price_cache)
+        priced_count = sum(1 for record in missing_titles + missing_dlcs if record.price)
+        logger.info(f"Prices joined into {priced_count} missing titles and DLCs, price list saved to {txt_file_path}")
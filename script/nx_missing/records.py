@@ -0,0 +1,111 @@
+import os
+import json
+from dataclasses import dataclass
+
+# Record types shared by all stages. Each one knows its TXT row and its JSON fields,
+# so the TXT and JSON outputs are always written from the same values in a single pass.
+# Prices are only written once the prices stage has joined them, as an optional trailing field, so priced and
+# unpriced rows of the same TXT file have different column counts (see the Data Format section of the README).
+
+@dataclass(slots=True)
+class Title:
+    title_id: str
+    release_date: str
+    title_name: str
+    size: int
+    price: str = None
+
+    def txt_row(self):
+        row = f"{self.title_id}|{self.release_date}|{self.title_name}|{self.size}"
+        return row if self.price is None else f"{row}|{self.price}"
+
+    def json_fields(self):
+        fields = (("Release Date", self.release_date), ("Title Name", self.title_name), ("size", self.size))
+        return fields if self.price is None else fields + (("price", self.price),)
+
+@dataclass(slots=True)
+class DLC:
+    title_id: str
+    release_date: str
+    dlc_name: str
+    base_game: str
+    size: int
+    price: str = None
+
+    def txt_row(self):
+        row = f"{self.title_id}|{self.release_date}|{self.dlc_name}|{self.base_game}|{self.size}"
+        return row if self.price is None else f"{row}|{self.price}"
+
+    def json_fields(self):
+        fields = (("Release Date", self.release_date), ("dlc_name", self.dlc_name), ("base_game", self.base_game), ("size", self.size))
+        return fields if self.price is None else fields + (("price", self.price),)
+
+@dataclass(slots=True)
+class Update:
+    title_id: str
+    game_name: str
+    version: str
+    release_date: str
+
+    def txt_row(self):
+        return f"{self.title_id}|{self.game_name}|{self.version}|{self.release_date}"
+
+    def json_fields(self):
+        return (("Game Name", self.game_name), ("Version", self.version), ("Release Date", self.release_date))
+
+@dataclass(slots=True)
+class OldUpdate:
+    title_id: str
+    version: str
+    release_date: str
+
+    def txt_row(self):
+        return f"{self.title_id}|{self.version}|{self.release_date}"
+
+    def json_fields(self):
+        return (("Version", self.version), ("Release Date", self.release_date))
+
+# Function to format the JSON fields of a record the same way json.dump(indent=4) does at the given depth
+def format_json_fields(record, indent):
+    inner = '\n' + ' ' * (indent + 4)
+    body = (',' + inner).join(f"{json.dumps(key)}: {json.dumps(value)}" for key, value in record.json_fields())
+    return '{' + inner + body + '\n' + ' ' * indent + '}'
+
+# Function to write the TXT and JSON forms of a list of records in a single pass
+# With grouped=True the JSON maps each title ID to the list of its records (records must be grouped by title ID)
+def write_records(data_directory, name, records, txt=True, grouped=False):
+    json_file_path = os.path.join(data_directory, f"{name}.json")
+    txt_file_path = os.path.join(data_directory, f"{name}.txt")
+
+    txt_file = open(txt_file_path, 'w', encoding='utf-8') if txt else None
+    try:
+        with open(json_file_path, 'w', encoding='utf-8') as json_file:
+            json_file.write('{')
+            first = True
+            current_title_id = None
+            for record in records:
+                if txt_file:
+                    txt_file.write(record.txt_row() if first else '\n' + record.txt_row())
+
+                if grouped and record.title_id == current_title_id:
+                    json_file.write(',\n        ' + format_json_fields(record, 8))
+                    continue
+                if grouped and current_title_id is not None:
+                    json_file.write('\n    ]')
+
+                json_file.write(('\n    ' if first else ',\n    ') + json.dumps(record.title_id) + ': ')
+                if grouped:
+                    json_file.write('[\n        ' + format_json_fields(record, 8))
+                    current_title_id = record.title_id
+                else:
+                    json_file.write(format_json_fields(record, 4))
+                first = False
+
+            if grouped and current_title_id is not None:
+                json_file.write('\n    ]')
+            json_file.write('}' if first else '\n}')
+    finally:
+        if txt_file:
+            txt_file.close()
+
+    return json_file_path, txt_file_path
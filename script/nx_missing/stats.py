@@ -0,0 +1,74 @@
+import os
+import json
+
+# Name of the stats manifest written next to the other data files
+STATS_FILE_NAME = 'stats.json'
+
+# Function to read a field from a dict entry or from a record object
+def get_field(entry, key):
+    return entry.get(key) if isinstance(entry, dict) else getattr(entry, key)
+
+# Function to build aggregates for one output while its entries are generated; entries whose group is in
+# ignored_groups, such as placeholder names, still count but are left out of the per-group histogram
+def build_stats(entries, date_key='Release Date', size_key=None, group_key=None, ignored_groups=()):
+    years = {}
+    months = {}
+    groups = {}
+    total_size = 0
+    count = 0
+
+    for entry in entries:
+        count += 1
+
+        # Bucket by year and month using the YYYY-MM-DD prefix of the date
+        release_date = get_field(entry, date_key) if date_key else None
+        if release_date and len(release_date) >= 7 and release_date[:4].isdigit():
+            year = release_date[:4]
+            month = release_date[:7]
+            years[year] = years.get(year, 0) + 1
+            months[month] = months.get(month, 0) + 1
+
+        if size_key:
+            try:
+                total_size += int(get_field(entry, size_key) or 0)
+            except (TypeError, ValueError):
+                pass
+
+        if group_key:
+            group = get_field(entry, group_key)
+            if group not in ignored_groups:
+                groups[group] = groups.get(group, 0) + 1
+
+    stats = {
+        "count": count,
+        "years": dict(sorted(years.items(), reverse=True)),
+        "months": dict(sorted(months.items(), reverse=True))
+    }
+    if size_key:
+        stats["total_size"] = total_size
+    if group_key:
+        stats["per_" + group_key] = dict(sorted(groups.items(), key=lambda x: x[1], reverse=True))
+    return stats
+
+# Function to load the stats manifest, returning an empty manifest if it does not exist yet
+def load_stats(data_directory):
+    stats_file_path = os.path.join(data_directory, STATS_FILE_NAME)
+    try:
+        with open(stats_file_path, 'r', encoding='utf-8') as stats_file:
+            return json.load(stats_file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error reading JSON from {stats_file_path}: {e}")
+        return {}
+
+# Function to update a section of the stats manifest, keeping the sections written by other stages
+def write_stats(data_directory, section, stats):
+    manifest = load_stats(data_directory)
+    manifest[section] = stats
+
+    stats_file_path = os.path.join(data_directory, STATS_FILE_NAME)
+    tmp_file_path = stats_file_path + '.tmp'
+    with open(tmp_file_path, 'w', encoding='utf-8') as stats_file:
+        json.dump(manifest, stats_file, indent=4, ensure_ascii=False)
+    os.replace(tmp_file_path, stats_file_path)
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import logging
+from datetime import datetime
+from .stats import build_stats, write_stats
+from .history import record_deltas
+from .records import Title, write_records
+from .prices import apply_cached_prices
+
+logger = logging.getLogger(__name__)
+
+# Base URL for fetching JSON files
+base_url = "https://raw.githubusercontent.com/blawar/titledb/master/"
+
+# List of JSON file endpoints
+json_files = [
+    "AR.en.json", "AR.es.json", "AT.de.json", "AU.en.json", "BE.fr.json", "BE.nl.json",
+    "BG.en.json", "BR.en.json", "BR.pt.json", "CA.en.json", "CA.fr.json", "CH.de.json",
+    "CH.fr.json", "CH.it.json", "CL.en.json", "CL.es.json", "CN.en.json", "CN.zh.json",
+    "CO.en.json", "CO.es.json", "CY.en.json", "CZ.en.json", "DE.de.json", "DK.en.json",
+    "EE.en.json", "ES.es.json", "FI.en.json", "FR.fr.json", "GB.en.json", "GR.en.json",
+    "HK.zh.json", "HR.en.json", "HU.en.json", "IE.en.json", "IL.en.json", "IT.it.json",
+    "JP.ja.json", "KR.ko.json", "LT.en.json", "LU.de.json", "LU.fr.json", "LV.en.json",
+    "MT.en.json", "MX.en.json", "MX.es.json", "NL.nl.json", "NO.en.json", "NZ.en.json",
+    "PE.en.json", "PE.es.json", "PL.en.json", "PT.pt.json", "RO.en.json", "RU.ru.json",
+    "SE.en.json", "SI.en.json", "SK.en.json", "US.en.json", "US.es.json", "ZA.en.json"
+]
+
+# Function to fetch and process each JSON file into merged_data, returning whether it was loaded
+async def fetch_and_process_json(session, url, merged_data):
+    async with session.get(url) as response:
+        if response.status == 200:
+            content_type = response.headers.get('Content-Type', '')
+            if 'application/json' in content_type:
+                try:
+                    data = await response.json()
+                except json.JSONDecodeError:
+                    logger.warning(f"Failed to decode JSON from {url} - Skipping")
+                    return False
+            elif 'text/plain' in content_type:
+                try:
+                    # Attempt to manually load JSON from the text content
+                    text_data = await response.text()
+                    data = json.loads(text_data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Failed to parse JSON from text/plain content at {url} - Skipping")
+                    return False
+            else:
+                logger.warning(f"Skipped {url} - Content-Type was {content_type}")
+                return False
+
+            # No await happens while merging, so the event loop never interleaves two files here
+            for entry_id, details in data.items():
+                # Extract the required fields
+                title_id = details.get("id")
+                release_date = details.get("releaseDate")
+                title_name = details.get("name")
+                size = details.get("size")
+
+                # Ensure release_date is a string before processing
+                if release_date is not None:
+                    release_date = str(release_date)
+
+                # Format release_date if it's in the format YYYYMMDD
+                if release_date and len(release_date) == 8 and release_date.isdigit():
+                    try:
+                        formatted_date = datetime.strptime(release_date, "%Y%m%d").strftime("%Y-%m-%d")
+                    except ValueError:
+                        formatted_date = release_date  # Keep the original if parsing fails
+                else:
+                    formatted_date = release_date
+
+                # Avoid duplicates: only add if title_id is not already in merged_data
+                if title_id and title_id not in merged_data:
+                    merged_data[title_id] = Title(title_id, formatted_date, title_name, size)
+            logger.info(f"Processed data from {url}")
+            return True
+        else:
+            logger.error(f"Failed to fetch data from {url} - Status Code: {response.status}")
+            return False
+
+# Function to handle all JSON files asynchronously, returning the number of files that failed to load
+async def process_all_files(merged_data):
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        tasks = []
+        for file in json_files:
+            url = base_url + file
+            logger.info(f"Processing: {url}")
+            tasks.append(fetch_and_process_json(session, url, merged_data))
+        
+        results = await asyncio.gather(*tasks)
+    return sum(1 for loaded in results if not loaded)
+
+# Function to find missing titles by comparing titles_db.json with working.txt
+def find_missing_titles(data_directory, record_history=True):
+    # Load titles_db.json
+    json_file_path = os.path.join(data_directory, 'titles_db.json')
+    with open(json_file_path, 'r', encoding='utf-8') as json_file:
+        titles_db = json.load(json_file)
+    
+    # Load working.txt
+    working_txt_path = os.path.join(data_directory, 'working.txt')
+    with open(working_txt_path, 'r', encoding='utf-8') as txt_file:
+        working_titles = set(line.split('|')[0].strip().upper() for line in txt_file)  # Normalize title_ids
+    
+    # Find missing titles that end with '000'
+    missing_titles = {}
+    
+    for title_id, details in titles_db.items():
+        # Normalize the title_id for comparison
+        normalized_title_id = title_id.upper()
+        if normalized_title_id.endswith('000') and normalized_title_id not in working_titles:
+            missing_titles[normalized_title_id] = Title(normalized_title_id, details.get("Release Date"), details.get("Title Name"), details.get("size"))
+    
+    # Keep the prices joined by the prices stage until it runs again
+    apply_cached_prices(data_directory, missing_titles.values())
+
+    # Write missing-titles.json and missing-titles.txt
+    missing_json_file_path, missing_txt_file_path = write_records(data_directory, 'missing-titles', missing_titles.values())
+    logger.info(f"Missing titles saved to {missing_json_file_path} and {missing_txt_file_path}")
+
+    # Update the stats manifest with the missing titles aggregates
+    write_stats(data_directory, 'missing-titles', build_stats(missing_titles.values(), date_key='release_date', size_key='size'))
+
+    # Append the titles that became missing or were resolved since the last run to the history store;
+    # an incomplete titledb would log every title it lacks as resolved, so it is left out of the history
+    if record_history and titles_db:
+        record_deltas(data_directory, 'missing-titles', missing_titles.keys())
+    else:
+        logger.warning("titledb was not fully loaded, history not updated for missing titles.")
+
+# Function to rebuild titles_db from titledb and save the missing titles
+def update_titles(data_directory):
+    merged_data = {}
+    failed_count = asyncio.run(process_all_files(merged_data))
+    if failed_count:
+        logger.warning(f"{failed_count} titledb files failed to load.")
+
+    # Sort the data by release date in descending order (most recent first)
+    sorted_data = sorted(merged_data.values(), key=lambda title: title.release_date or '', reverse=True)
+
+    # Write the sorted merged JSON and TXT output
+    json_file_path, txt_file_path = write_records(data_directory, 'titles_db', sorted_data)
+    logger.info(f"Merged data saved to {json_file_path} and {txt_file_path}")
+
+    # Record whether every titledb file loaded, so later stages reading titles_db can tell a partial one
+    titles_db_stats = build_stats(sorted_data, date_key='release_date', size_key='size')
+    titles_db_stats["complete"] = not failed_count
+    write_stats(data_directory, 'titles_db', titles_db_stats)
+    
+    # Find missing titles
+    find_missing_titles(data_directory, record_history=not failed_count)
@@ -0,0 +1,229 @@
+import os
+import asyncio
+from .stats import build_stats, write_stats
+from .history import record_deltas
+from .records import Update, OldUpdate, write_records
+
+# URL of the latest version of every update
+VERSIONS_URL = "https://raw.githubusercontent.com/blawar/titledb/master/versions.json"
+
+# Function to load working.txt data
+def load_working_data(file_path):
+    try:
+        working_data = {}
+        with open(file_path, 'r', encoding='utf-8') as working_file:
+            for line in working_file:
+                if '|' in line:
+                    title_id, version = line.strip().split('|')
+                    version = int(version)
+                    if title_id not in working_data:
+                        working_data[title_id] = {"Versions": set(), "Game Name": title_id}
+                    working_data[title_id]["Versions"].add(version)
+        print(f"Loaded working.txt with {len(working_data)} entries.")
+        return working_data
+    except FileNotFoundError:
+        print(f"Error: working.txt file not found at {file_path}")
+        return None
+    except Exception as e:
+        print(f"Error reading working.txt: {e}")
+        return None
+
+# Asynchronous function to fetch game name from tinfoil.io
+async def fetch_game_name(session, title_id):
+    url = f"https://api.nlib.cc/nx/{title_id[:-3]}000"
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json()
+            game_name = data.get("name", "UNKNOWN GAME")
+            return title_id, game_name
+    except Exception as e:
+        print(f"Error fetching game name for {title_id}: {e}")
+        return title_id, "UNKNOWN GAME"
+
+# Asynchronous function to manage the fetching process
+async def fetch_all_game_names(title_ids):
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        tasks = [fetch_game_name(session, title_id) for title_id in title_ids]
+        return await asyncio.gather(*tasks)
+
+# Function to fetch all game names using asyncio
+def fetch_game_names(title_ids):
+    return asyncio.run(fetch_all_game_names(title_ids))
+
+# Normalize function to handle case differences and strip whitespace
+def normalize_title_id(tid):
+    return tid.strip().lower()
+
+# Build a map from normalized title IDs to the actual keys, keeping the first key like a linear search would
+def build_normalized_keys(data_dict):
+    normalized_keys = {}
+    for key in data_dict:
+        normalized_keys.setdefault(normalize_title_id(key), key)
+    return normalized_keys
+
+# Find the actual key in the dictionary after normalization
+def find_normalized_key(search_key, normalized_keys):
+    return normalized_keys.get(normalize_title_id(search_key))
+
+# Function to download versions.json from GitHub
+def load_latest_versions():
+    import requests
+
+    try:
+        response = requests.get(VERSIONS_URL)
+        response.raise_for_status()
+        latest_versions_data = response.json()
+        print(f"Loaded versions.json with {len(latest_versions_data)} entries from GitHub.")
+        return latest_versions_data
+    except requests.RequestException as e:
+        print(f"Error downloading versions.json: {e}")
+        return {}
+
+# Function to find missing updates by comparing versions.json with working.txt
+def find_missing_updates(data_directory):
+    # Path for working.txt
+    working_file_path = os.path.join(data_directory, 'working.txt')
+
+    # Check if working.txt exists
+    working_data = load_working_data(working_file_path)
+
+    # If working.txt does not exist, scan the library to generate it
+    if working_data is None:
+        from .library import scan_library
+
+        # With manifests, the scan only writes a partial manifest and working.txt comes from the merge
+        if os.getenv('PARTIAL_MANIFEST_DIR') or os.getenv('MERGE_MANIFEST_DIR'):
+            raise RuntimeError("working.txt is missing; run the merge on the coordinator first.")
+
+        print("Scanning the library to generate working.txt...")
+        scan_library(data_directory)
+        # Reload working.txt after scanning the library
+        working_data = load_working_data(working_file_path)
+        if working_data is None:
+            raise RuntimeError("Unable to load working.txt even after scanning the library.")
+
+    # Load the versions.json data from GitHub
+    latest_versions_data = load_latest_versions()
+
+    # Index working.txt by normalized title ID so each lookup is a dict access
+    normalized_keys = build_normalized_keys(working_data)
+
+    # Data structures to hold missing updates
+    missing_updates = {}
+    missing_old_updates = {}
+
+    # Counters for statistics
+    total_entries = 0
+    missing_updates_count = 0
+    missing_old_updates_count = 0
+
+    # Prepare a list of title_ids to fetch game names
+    title_ids_to_fetch = set()
+
+    # Check for missing or outdated versions
+    for title_id, version_info in latest_versions_data.items():
+        # Modify the title_id: change the last three digits from 000 to 800
+        modified_title_id = title_id[:-3] + '800'
+
+        # Get the latest version and date from the versions.json data
+        latest_version = max(map(int, version_info.keys()))
+        latest_date = version_info[str(latest_version)]
+
+        # Find the actual key for modified_title_id in working.txt data
+        found_key = find_normalized_key(modified_title_id, normalized_keys)
+
+        if found_key:
+            working_versions = working_data[found_key]["Versions"]
+            game_name = None
+
+            # Check if the latest version is missing in working.txt
+            if latest_version not in working_versions:
+                missing_updates_count += 1
+                # We need to fetch the game name
+                title_ids_to_fetch.add(found_key)
+
+                # Add only the missing versions that are not the latest version to missing_old_updates
+                for version in sorted(map(int, version_info.keys())):
+                    if version > max(working_versions) and version != latest_version:
+                        missing_old_updates_count += 1
+                        missing_old_updates.setdefault(modified_title_id, []).append(OldUpdate(modified_title_id, str(version), version_info[str(version)]))
+        else:
+            # If the modified_title_id is not found, try the original_title_id with '000' suffix
+            original_title_id = title_id[:-3] + '000'
+            found_key = find_normalized_key(original_title_id, normalized_keys)
+
+            if found_key:
+                title_ids_to_fetch.add(found_key)
+            else:
+                title_ids_to_fetch.add(title_id[:-3] + '000')
+
+            missing_updates_count += 1
+
+            # Add only the missing versions that are not the latest version to missing_old_updates
+            for version, date in version_info.items():
+                if int(version) != latest_version:
+                    missing_old_updates_count += 1
+                    missing_old_updates.setdefault(modified_title_id, []).append(OldUpdate(modified_title_id, version, date))
+
+        total_entries += 1
+
+    # Fetch all game names asynchronously
+    fetched_game_names = fetch_game_names(title_ids_to_fetch)
+
+    # Map fetched game names to their title IDs
+    game_name_map = {title_id: game_name for title_id, game_name in fetched_game_names}
+
+    # Update missing_updates with fetched game names
+    for title_id, version_info in latest_versions_data.items():
+        modified_title_id = title_id[:-3] + '800'
+        latest_version = max(map(int, version_info.keys()))
+        latest_date = version_info[str(latest_version)]
+
+        found_key = find_normalized_key(modified_title_id, normalized_keys)
+
+        if found_key:
+            if latest_version not in working_data[found_key]["Versions"]:
+                game_name = game_name_map.get(found_key, "UNKNOWN GAME")
+                missing_updates[modified_title_id] = Update(modified_title_id, game_name, str(latest_version), latest_date)
+        else:
+            original_title_id = title_id[:-3] + '000'
+            found_key = find_normalized_key(original_title_id, normalized_keys)
+            game_name = game_name_map.get(found_key or title_id[:-3] + '000', "UNKNOWN GAME")
+            missing_updates[modified_title_id] = Update(modified_title_id, game_name, str(latest_version), latest_date)
+
+    # Sort missing updates by Release Date in descending order
+    sorted_missing_updates = sorted(missing_updates.values(), key=lambda update: update.release_date, reverse=True)
+    sorted_missing_old_updates = [old_update for versions in missing_old_updates.values() for old_update in sorted(versions, key=lambda x: x.release_date, reverse=True)]
+
+    # Write missing-updates.txt and missing-updates.json files; the TXT has one row per update title ID like the JSON,
+    # where the standalone script appended a row for every versions.json key, repeating TIDs that map to the same update
+    missing_json_file_path, missing_txt_file_path = write_records(data_directory, 'missing-updates', sorted_missing_updates)
+    print(f"\nFiles {missing_txt_file_path} and {missing_json_file_path} generated successfully.")
+
+    # Write missing-old-updates.json file
+    missing_old_updates_file_path, _ = write_records(data_directory, 'missing-old-updates', sorted_missing_old_updates, txt=False, grouped=True)
+    print(f"\nFile {missing_old_updates_file_path} generated successfully.")
+
+    # Update the stats manifest with the missing updates aggregates
+    write_stats(data_directory, 'missing-updates', build_stats(sorted_missing_updates, date_key='release_date'))
+    write_stats(data_directory, 'missing-old-updates', build_stats(sorted_missing_old_updates, date_key='release_date'))
+
+    # Append the updates that became missing or were resolved since the last run to the history store;
+    # without versions.json every missing update would be logged as resolved, so the history is left as is
+    if latest_versions_data:
+        # Keyed by version too, so a missing latest update moving from vN to vN+1 is recorded
+        record_deltas(data_directory, 'missing-updates', ((update.title_id, update.version) for update in sorted_missing_updates))
+        record_deltas(data_directory, 'missing-old-updates', ((old_update.title_id, old_update.version) for old_update in sorted_missing_old_updates))
+    else:
+        print("versions.json was not loaded, history not updated for missing updates.")
+
+    # Print summary
+    print(f"\nSummary:")
+    print(f"Total entries in versions.json: {total_entries}")
+    print(f"Total missing updates found: {missing_updates_count}")
+    print(f"Total old missing updates found: {missing_old_updates_count}")
+    print(f"Total entries in missing-updates.json: {len(missing_updates)}")
+    print(f"Total entries in missing-old-updates.json: {len(missing_old_updates)}")
@@ -23,7 +23,7 @@ function App() {
     return false;
   });
 
-  const { data, isLoading, error } = useDataLoader();
+  const { data, stats, isLoading, error } = useDataLoader();
 
   useEffect(() => {
     document.documentElement.classList.toggle('dark', isDark);
@@ -136,6 +136,7 @@ function App() {
               <ContentTable
                 type={activeTab as Exclude<TableType, 'home'>}
                 data={data[activeTab as Exclude<TableType, 'home'>]}
+                stats={stats?.[activeTab as Exclude<TableType, 'home'>]}
                 searchQuery={searchQuery}
                 onSearchChange={handleSearchChange}
               />
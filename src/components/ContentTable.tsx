@@ -1,7 +1,7 @@
 import React, { useState, useMemo, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
 import { Search, ArrowUpDown, Home, X } from 'lucide-react';
-import { TableType } from '../types';
+import { SectionStats, TableType } from '../types';
 import { DateFilter } from './DateFilter';
 import { ReleaseTimer } from './ReleaseTimer';
 import { formatDate, formatSize, getIconUrl } from '../utils/formatters';
@@ -9,11 +9,12 @@ import { formatDate, formatSize, getIconUrl } from '../utils/formatters';
 interface ContentTableProps {
   type: TableType;
   data: any;
+  stats?: SectionStats;
   searchQuery: string;
   onSearchChange: (query: string) => void;
 }
 
-export function ContentTable({ type, data, searchQuery, onSearchChange }: ContentTableProps) {
+export function ContentTable({ type, data, stats, searchQuery, onSearchChange }: ContentTableProps) {
   const { t } = useTranslation();
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(10);
@@ -31,13 +32,15 @@ export function ContentTable({ type, data, searchQuery, onSearchChange }: Conten
       'missing-titles': [
         { key: 'Title Name', label: t('table.columns.name'), sortable: true },
         { key: 'Release Date', label: t('table.columns.releaseDate'), sortable: true },
-        { key: 'size', label: t('table.columns.size'), sortable: true }
+        { key: 'size', label: t('table.columns.size'), sortable: true },
+        { key: 'price', label: t('table.columns.price'), sortable: true }
       ],
       'missing-dlcs': [
         { key: 'dlc_name', label: t('table.columns.name'), sortable: true },
         { key: 'base_game', label: t('table.columns.baseGame'), sortable: true },
         { key: 'Release Date', label: t('table.columns.releaseDate'), sortable: true },
-        { key: 'size', label: t('table.columns.size'), sortable: true }
+        { key: 'size', label: t('table.columns.size'), sortable: true },
+        { key: 'price', label: t('table.columns.price'), sortable: true }
       ],
       'missing-updates': [
         { key: 'Game Name', label: t('table.columns.game'), sortable: true },
@@ -61,6 +64,11 @@ export function ContentTable({ type, data, searchQuery, onSearchChange }: Conten
   };
 
   const availableYears = useMemo(() => {
+    // Use the precomputed year histogram from the stats manifest when available
+    if (stats?.years) {
+      return Object.keys(stats.years).sort((a, b) => b.localeCompare(a));
+    }
+
     const years = new Set<string>();
     const items = type === 'missing-old-updates'
       ? Object.values(data).flat()
@@ -72,7 +80,7 @@ export function ContentTable({ type, data, searchQuery, onSearchChange }: Conten
     });
 
     return Array.from(years).sort((a, b) => b.localeCompare(a));
-  }, [data, type]);
+  }, [data, type, stats]);
 
   const filteredAndSortedData = useMemo(() => {
     let items = type === 'missing-old-updates'
@@ -115,6 +123,9 @@ export function ContentTable({ type, data, searchQuery, onSearchChange }: Conten
         if (sortConfig.key === 'size') {
           aVal = parseInt(aVal || '0', 10);
           bVal = parseInt(bVal || '0', 10);
+        } else if (sortConfig.key === 'price') {
+          aVal = parseFloat(aVal || '0') || 0;
+          bVal = parseFloat(bVal || '0') || 0;
         } else if (sortConfig.key === 'Release Date') {
           aVal = new Date(aVal).getTime();
           bVal = new Date(bVal).getTime();
@@ -1,9 +1,10 @@
 import { useState, useEffect } from 'react';
-import { ContentData } from '../types';
-import { loadData } from '../utils/dataLoader';
+import { ContentData, ContentStats } from '../types';
+import { loadData, loadStats } from '../utils/dataLoader';
 
 export const useDataLoader = () => {
   const [data, setData] = useState<ContentData | null>(null);
+  const [stats, setStats] = useState<ContentStats | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<Error | null>(null);
 
@@ -12,8 +13,9 @@ export const useDataLoader = () => {
       try {
         setIsLoading(true);
         setError(null);
-        const result = await loadData();
+        const [result, statsResult] = await Promise.all([loadData(), loadStats()]);
         setData(result);
+        setStats(statsResult);
       } catch (err) {
         console.error('Error loading data:', err);
         setError(err instanceof Error ? err : new Error('Failed to load data'));
@@ -25,5 +27,5 @@ export const useDataLoader = () => {
     fetchData();
   }, []);
 
-  return { data, isLoading, error };
+  return { data, stats, isLoading, error };
 };
\ No newline at end of file
@@ -3,12 +3,14 @@ export interface DLCContent {
   dlc_name: string;
   base_game: string;
   size: number;
+  price?: string;
 }
 
 export interface TitleContent {
   'Release Date': string;
   'Title Name': string;
   size: number;
+  price?: string;
 }
 
 export interface UpdateContent {
@@ -30,8 +32,18 @@ export interface ContentData {
   'home': never;
 }
 
+export interface SectionStats {
+  count: number;
+  years: Record<string, number>;
+  months: Record<string, number>;
+  total_size?: number;
+  per_base_game?: Record<string, number>;
+}
+
 export type TableType = keyof ContentData;
 
+export type ContentStats = Partial<Record<Exclude<TableType, 'home'> | 'working', SectionStats>>;
+
 export interface TableColumn {
   key: string;
   label: string;
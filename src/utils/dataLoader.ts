@@ -1,4 +1,4 @@
-import { ContentData } from '../types';
+import { ContentData, ContentStats } from '../types';
 
 const getDataUrl = (filename: string) => {
   // Add timestamp to prevent caching
@@ -78,6 +78,25 @@ export const loadData = async (): Promise<ContentData> => {
   }
 };
 
+// The stats manifest is optional: callers fall back to scanning the data when it is missing
+export const loadStats = async (): Promise<ContentStats | null> => {
+  try {
+    const response = await fetch(getDataUrl('stats.json'), {
+      headers: {
+        'Cache-Control': 'no-cache, no-store, must-revalidate',
+        'Pragma': 'no-cache'
+      }
+    });
+    if (!response.ok) {
+      return null;
+    }
+    return await response.json();
+  } catch (error) {
+    console.warn('Stats manifest unavailable:', error);
+    return null;
+  }
+};
+
 const parseTxtFile = (content: string, type: 'titles' | 'dlcs' | 'updates') => {
   if (!content?.trim()) {
     return {};
@@ -91,26 +110,29 @@ const parseTxtFile = (content: string, type: 'titles' | 'dlcs' | 'updates') => {
     
     switch (type) {
       case 'titles':
-        if (parts.length === 4) {
-          const [id, date, name, size] = parts;
+        // A trailing price is present once the prices stage has run
+        if (parts.length === 4 || parts.length === 5) {
+          const [id, date, name, size, price] = parts;
           result[id] = {
             id,
             'Release Date': date,
             'Title Name': name,
-            size: parseInt(size, 10) || 0
+            size: parseInt(size, 10) || 0,
+            ...(price && { price })
           };
         }
         break;
 
       case 'dlcs':
-        if (parts.length === 5) {
-          const [id, date, name, baseGame, size] = parts;
+        if (parts.length === 5 || parts.length === 6) {
+          const [id, date, name, baseGame, size, price] = parts;
           result[id] = {
             id,
             'Release Date': date,
             dlc_name: name,
             base_game: baseGame,
-            size: parseInt(size, 10) || 0
+            size: parseInt(size, 10) || 0,
+            ...(price && { price })
           };
         }
         break;